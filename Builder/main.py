@@ -18,9 +18,7 @@ asset_details = {
     'shares_outstanding' : 1474846
 }
 
-generator = RandomBardata()
-generator.create_bars(200)
-asset_bardata = generator.bardata
+asset_bardata = RandomBardata.create_bars(200)
 
 client.create_asset(asset = new_asset)
 client.create_asset_details(ticker=new_asset['ticker'], asset_type=new_asset['type'],data=asset_details)
@@ -1,30 +1,24 @@
-import random 
-import datetime
+import numpy as np
 
 class RandomBardata:
-    def __init__(self):
-        self.bardata = []
-        self.date = '2023-01-01'
+    START_DATE = np.datetime64('2023-01-01')
 
-    def _next_valid_date(self):
-        date = datetime.datetime.strptime(self.date, '%Y-%m-%d')
-        date += datetime.timedelta(days=1)
-        formatted_date = date.strftime('%Y-%m-%d')
-        return formatted_date
-    
-    def _generate_random_float(self):
-        return round(random.uniform(0.5, 50),2)
+    @classmethod
+    def create_bars(cls, num_bars:int):
+        rng = np.random.default_rng()
+        prices = rng.uniform(0.5, 50, (num_bars, 5)).round(2).tolist()
+        volumes = (rng.integers(0, 500, num_bars) * 2 + 1).tolist()
+        dates = np.datetime_as_string(cls.START_DATE + np.arange(num_bars), unit='D').tolist()
 
-    def create_bars(self, num_bars:int):
-        for _ in range(num_bars):
-            new_bar = {
-                'date' : self.date,
-                'open': self._generate_random_float(),
-                'close': self._generate_random_float(),
-                'high': self._generate_random_float(),
-                'low': self._generate_random_float(),
-                'volume': random.choice(range(1, 1000, 2)),
-                'adjusted_close' : self._generate_random_float(),
+        return [
+            {
+                'date' : date,
+                'open': open,
+                'close': close,
+                'high': high,
+                'low': low,
+                'volume': volume,
+                'adjusted_close' : adjusted_close,
             }
-            self.bardata.append(new_bar)
-            self.date = self._next_valid_date()
+            for date, (open, close, high, low, adjusted_close), volume in zip(dates, prices, volumes)
+        ]
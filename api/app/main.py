@@ -1,7 +1,25 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 import app.routes as routes
+import services.buffer as buffer
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs the bardata buffer flusher for the lifetime of the app, flushing what is left on shutdown."""
+    flusher = asyncio.create_task(buffer.run_flusher())
+    yield
+    flusher.cancel()
+    try:
+        await buffer.flush()
+    except Exception as e:
+        logger.warning(f"Bardata buffer flush on shutdown failed: {e}")
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Include routes
 app.include_router(routes.router)
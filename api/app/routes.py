@@ -1,7 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Body
-from sqlalchemy.orm import Session
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession
 import app.schemas as schemas
 import services.services as services
+import services.cache as cache
+import services.buffer as buffer
+import services.utils as service_utils
 from typing import Optional, List, Dict
 from database import utils as database_utils
 
@@ -10,59 +16,74 @@ router = APIRouter()
 # =================== ADMIN ENDPOINTS ===================
 
 @router.get("/api/database/connection-check")
-def check_database_connection(db: Session = Depends(database_utils._get_db)):
+async def check_database_connection(db: AsyncSession = Depends(database_utils._get_db)):
     """Checks if the API can successfully connect to the database."""
-    return database_utils._check_database_connection(db=db)
+    return await database_utils._check_database_connection(db=db)
 
 # Endpoint to construct database tables
 @router.post("/api/database/")
-def create_tables():
+async def create_tables():
     """Creates necessary database tables."""
-    database_utils._create_tables()
+    await database_utils._create_tables()
 
 # Endpoint to delete database tables
 @router.delete("/api/database/")
-def delete_tables():
+async def delete_tables():
     """Deletes the specified database tables."""
-    database_utils._delete_tables()
+    await database_utils._delete_tables()
+    await cache.clear()
+    await buffer.clear()
+
+# Endpoint to write buffered bardata to the database
+@router.post("/api/bardata/flush")
+async def flush_bardata():
+    """Writes every buffered bardata entry to the database."""
+    return {"flushed": await buffer.flush()}
 
 # =================== ASSET CRUD OPERATIONS ===================
 
 # Endpoint to create a new asset
 @router.post("/api/asset/", response_model=schemas.RetrieveAsset)
-async def create_asset_endpoint(asset: schemas.CreateAsset, db: Session = Depends(database_utils._get_db)):
+async def create_asset_endpoint(asset: schemas.CreateAsset, db: AsyncSession = Depends(database_utils._get_db)):
     """Creates a new asset entry in the database."""
     result, success = await services.create_asset(db=db, asset=asset)
     if not success:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result)
     return result
 
+def resolve_asset_type(ticker: Optional[str] = None, asset_type: Optional[str] = None) -> Optional[schemas.AssetType]:
+    """Resolves an optional 'asset_type' query parameter to its AssetType before the endpoint runs, a ticker lookup ignores it."""
+    return service_utils.asset_type(asset_type) if asset_type and not ticker else None
+
 # Endpoint to retrieve assets based on filters
 @router.get("/api/asset/", response_model=List[schemas.RetrieveAsset])
-async def get_asset(ticker: Optional[str] = None, asset_type: Optional[str] = None, db: Session = Depends(database_utils._get_db)):
+async def get_asset(ticker: Optional[str] = None, asset_type: Optional[schemas.AssetType] = Depends(resolve_asset_type), db: AsyncSession = Depends(database_utils._get_db)):
     """Retrieves assets from the database based on provided filters."""
     return await services.get_assets(db=db, ticker=ticker, asset_type=asset_type)
 
 # Endpoint to delete an asset
 @router.delete("/api/asset/")
-async def delete_asset(ticker: str, asset_id: int, db: Session = Depends(database_utils._get_db)):
+async def delete_asset(ticker: str, asset_id: int, db: AsyncSession = Depends(database_utils._get_db)):
     """Deletes an asset entry from the database."""
     return await services.delete_asset(db=db, ticker=ticker, asset_id=asset_id)
 
 # Endpoint to edit an asset's details
 @router.put("/api/asset/{asset_id}", response_model=schemas.RetrieveAsset)
-async def edit_asset(asset_id: int, edits: dict, db: Session = Depends(database_utils._get_db)):
+async def edit_asset(asset_id: int, edits: dict, db: AsyncSession = Depends(database_utils._get_db)):
     """Updates an asset's details in the database."""
     return await services.edit_asset(db=db, asset_id=asset_id, edits=edits)
 
 # =================== ASSET DETAILS CRUD OPERATIONS ===================
+# The endpoint factories resolve their AssetType once, when the routes are registered
 
 # Function to generate endpoint for creating asset details
 def create_asset_details_endpoint(asset_type, create_schema, retrieve_schema):
     """Generates an endpoint for creating asset details."""
+    asset_class = schemas.AssetType[asset_type.upper()]
+
     @router.post(f"/api/{asset_type}/{{ticker}}/", response_model=retrieve_schema)
-    async def create_asset_details(data: create_schema, ticker: str = Path(...), db: Session = Depends(database_utils._get_db)):
-        result, success = await services.add_details(db=db, ticker=ticker, asset_type=asset_type, data=data)
+    async def create_asset_details(data: create_schema, ticker: str = Path(...), db: AsyncSession = Depends(database_utils._get_db)):
+        result, success = await services.add_details(db=db, ticker=ticker, asset_type=asset_class, data=data)
         if not success:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result)
         return result
@@ -70,45 +91,71 @@ def create_asset_details_endpoint(asset_type, create_schema, retrieve_schema):
 # Function to generate endpoints for retrieving asset details
 def get_details_endpoint(asset_type, retrieve_schema):
     """Generates endpoints for retrieving asset details."""
+    asset_class = schemas.AssetType[asset_type.upper()]
+
     @router.get(f"/api/{asset_type}/{{ticker}}", response_model=List[retrieve_schema])
-    async def get_details_by_ticker(ticker: str, db: Session = Depends(database_utils._get_db)):
-        return await services.get_details(db=db, asset_type_str=asset_type, ticker=ticker)
+    async def get_details_by_ticker(ticker: str, db: AsyncSession = Depends(database_utils._get_db)):
+        return await services.get_details(db=db, asset_type=asset_class, ticker=ticker)
 
     @router.post(f"/api/{asset_type}", response_model=List[retrieve_schema])
-    async def get_details_by_filter(criteria: dict, db: Session = Depends(database_utils._get_db)):
-        return await services.get_details(db=db, asset_type_str=asset_type, filter_criteria=criteria)
+    async def get_details_by_filter(criteria: dict, db: AsyncSession = Depends(database_utils._get_db)):
+        return await services.get_details(db=db, asset_type=asset_class, filter_criteria=criteria)
 
 # Function to generate endpoints for editing asset details
 def edit_asset_details_endpoint(asset_type, retrieve_schema):
     """Generates an endpoint for editing asset details."""
+    asset_class = schemas.AssetType[asset_type.upper()]
+
     @router.put(f"/api/{asset_type}/{{asset_id}}", response_model=retrieve_schema)
-    async def edit_asset_details(asset_id: int, edits: dict, db: Session = Depends(database_utils._get_db)):
-        return await services.edit_asset_details(db=db, asset_type=asset_type, asset_id=asset_id, edits=edits)
+    async def edit_asset_details(asset_id: int, edits: dict, db: AsyncSession = Depends(database_utils._get_db)):
+        return await services.edit_asset_details(db=db, asset_type=asset_class, asset_id=asset_id, edits=edits)
 
 # =================== ASSET BAR DATA CRUD OPERATIONS ===================
 
+def _validate_bardata(data: List[dict]) -> List[schemas.CreateBardata]:
+    """Validates a bardata upload in a single call, reporting errors as FastAPI does for request bodies."""
+    try:
+        return schemas.BardataListAdapter.validate_python(data)
+    except pydantic.ValidationError as e:
+        raise RequestValidationError([{**error, 'loc': ('body', *error['loc'])} for error in e.errors(include_url=False)])
+
 # Function to generate endpoint for creating bardata
 def create_bardata_endpoint_router(asset_type):
-    """Generates an endpoint for creating bardata."""
-    @router.post(f"/api/{asset_type}/{{ticker}}/bardata/", response_model=List[schemas.RetrieveBardata])
-    async def create_bardata(data: List[schemas.CreateBardata], ticker: str = Path(...), db: Session = Depends(database_utils._get_db)):
-        result, success = await services.add_bardata(db=db, ticker=ticker, asset_type=asset_type, data=data)
+    """Generates endpoints for creating and buffering bardata."""
+    asset_class = schemas.AssetType[asset_type.upper()]
+
+    @router.post(f"/api/{asset_type}/{{ticker}}/bardata/", response_model=schemas.BardataUpload)
+    async def create_bardata(data: List[dict] = Body(...), ticker: str = Path(...), db: AsyncSession = Depends(database_utils._get_db)):
+        result, success = await services.add_bardata(db=db, ticker=ticker, asset_type=asset_class, data=_validate_bardata(data))
         if not success:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result)
         return result
 
+    # Buffered in Redis and written in bulk by the background flusher, for high frequency feeds
+    @router.post(f"/api/{asset_type}/{{ticker}}/bardata/buffer", status_code=status.HTTP_202_ACCEPTED)
+    async def buffer_bardata(data: List[dict] = Body(...), ticker: str = Path(...)):
+        return {"buffered": await buffer.push(asset_type=asset_class, ticker=ticker, data=_validate_bardata(data))}
+
 # Endpoint to retrieve bardata based on filters
 @router.post("/api/bardata/", response_model=Dict[str, List[schemas.RetrieveBardata]])
-async def get_bardata(criteria: schemas.BardataFilter = Body(...), db: Session = Depends(database_utils._get_db)):
+async def get_bardata(criteria: schemas.BardataFilter = Body(...), db: AsyncSession = Depends(database_utils._get_db)):
     """Retrieves bardata based on provided criteria."""
-    return await services.get_bardata(db=db, **criteria.dict())
+    return await services.get_bardata(db=db, **criteria.model_dump())
+
+# Endpoint to stream bardata based on filters, as newline delimited JSON
+@router.post("/api/bardata/stream")
+async def stream_bardata(criteria: schemas.BardataFilter = Body(...), db: AsyncSession = Depends(database_utils._get_db)):
+    """Streams bardata based on provided criteria, one row per line."""
+    return StreamingResponse(await services.stream_bardata(db=db, **criteria.model_dump()), media_type="application/x-ndjson")
 
 # Function to generate endpoints for editing bardata
 def edit_bardata_endpoint(asset_type):
     """Generates an endpoint for editing bardata."""
+    asset_class = schemas.AssetType[asset_type.upper()]
+
     @router.put(f"/api/{asset_type}/bardata/{{asset_id}}", response_model=schemas.RetrieveBardata)
-    async def edit_bardata(asset_id: int, edits: dict, db: Session = Depends(database_utils._get_db)):
-        return await services.edit_bardata(db=db, asset_type=asset_type, asset_id=asset_id, edits=edits)
+    async def edit_bardata(asset_id: int, edits: dict, db: AsyncSession = Depends(database_utils._get_db)):
+        return await services.edit_bardata(db=db, asset_type=asset_class, asset_id=asset_id, edits=edits)
 
 # =================== CREATE ENDPOINTS BASED ON SCHEMAS ===================
 
@@ -1,10 +1,19 @@
 import datetime as dt
 import pydantic as pydantic
-from pydantic import validator
+from pydantic import ConfigDict, field_validator, model_serializer
 import database.models as models
 from enum import Enum
 from typing import Optional, List, Union
 
+def to_naive_utc(value):
+    """
+    Convert a timezone aware datetime to naive UTC, the form the database's DateTime columns store.
+    Naive datetimes and dates are returned unchanged.
+    """
+    if isinstance(value, dt.datetime) and value.tzinfo is not None:
+        return value.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return value
+
 # Asset Schemas
 class _BaseAsset(pydantic.BaseModel):
     """
@@ -13,14 +22,16 @@ class _BaseAsset(pydantic.BaseModel):
     ticker: str
     type: str
 
-    @validator('ticker', pre=True, always=True)
+    @field_validator('ticker', mode='before')
+    @classmethod
     def uppercase_ticker(cls, v):
         """
         Ensure the ticker is always in uppercase.
         """
         return v.upper()
 
-    @validator('type', pre=True, always=True)
+    @field_validator('type', mode='before')
+    @classmethod
     def lowercase_type(cls, v):
         """
         Ensure the asset type is always in lowercase.
@@ -35,8 +46,7 @@ class RetrieveAsset(_BaseAsset):
     created_at: dt.datetime
     updated_at: dt.datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CreateAsset(_BaseAsset):
     """
@@ -112,6 +122,8 @@ class _BaseCommodityFuture(pydantic.BaseModel):
     currency: str
     description: str
 
+    _naive_expiration_date = field_validator('expiration_date')(to_naive_utc)
+
 class CreateCommodityFuture(_BaseCommodityFuture):
     """
     Schema for creating a new commodity future.
@@ -137,18 +149,19 @@ class _BaseBardata(pydantic.BaseModel):
     close: Optional[float] = 0.0
     high: Optional[float] = 0.0
     low: Optional[float] = 0.0
-    volume: Optional[int] = 0.0
+    volume: Optional[int] = 0
     adjusted_close: Optional[float] = None
 
+    _naive_date = field_validator('date')(to_naive_utc)
+
 class CreateBardata(_BaseBardata):
     """
-    Schema for creating new bar data. Excludes the 'adjusted_close' field if its value is None.
+    Schema for creating new bar data.
     """
-    def dict(self, *args, **kwargs):
-        data = super().dict(*args, **kwargs)
-        if data.get("adjusted_close") is None:
-            data.pop("adjusted_close")
-        return data
+    pass
+
+# Validates a whole bardata upload in a single call
+BardataListAdapter = pydantic.TypeAdapter(List[CreateBardata])
 
 class RetrieveBardata(_BaseBardata):
     """
@@ -156,27 +169,38 @@ class RetrieveBardata(_BaseBardata):
     """
     asset_id: int
 
-    def dict(self, *args, **kwargs):
-        data = super().dict(*args, **kwargs)
+    @model_serializer(mode='wrap')
+    def drop_empty_adjusted_close(self, handler):
+        data = handler(self)
         if data.get("adjusted_close") is None:
-            data.pop("adjusted_close")
+            data.pop("adjusted_close", None)
         return data
 
+class BardataUpload(pydantic.BaseModel):
+    """
+    Schema for the result of a bar data upload, the inserted bar data and the dates skipped as already present.
+    """
+    bardata: List[RetrieveBardata]
+    skipped_dates: List[dt.datetime]
+
 class BardataFilter(pydantic.BaseModel):
     """
     Schema for filtering bar data based on tickers and date range.
     """
     tickers: List[str]
     start_date: Union[dt.datetime, dt.date]
-    end_date: Optional[Union[dt.datetime, dt.date]] = None
+    end_date: Optional[Union[dt.datetime, dt.date]] = pydantic.Field(default=None, validate_default=True)
 
-    @validator("end_date", pre=True, always=True)
+    @field_validator("end_date", mode='before')
+    @classmethod
     def set_end_date_default(cls, value):
         """
         Set the end date to the current datetime if it's not provided.
         """
         return value or dt.datetime.now()
 
+    _naive_dates = field_validator('start_date', 'end_date')(to_naive_utc)
+
 # Enum for models and schemas
 class AssetType(Enum):
     """
@@ -1,14 +1,39 @@
-from sqlalchemy import create_engine, exc
-import sqlalchemy.orm as orm 
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Connection pool settings
+POOL_SIZE = 20
+MAX_OVERFLOW = 40  # Burst headroom, get_bardata also holds extra connections for its concurrent fetches
+POOL_TIMEOUT = 30  # Seconds to wait for a free connection
+POOL_RECYCLE = 3600  # Seconds before a connection is replaced
+STATEMENT_TIMEOUT = 30000  # Milliseconds
+# Prepared statements kept per connection, set to 0 when connecting through PgBouncer in transaction mode
+STATEMENT_CACHE_SIZE = int(os.getenv('STATEMENT_CACHE_SIZE', 1024))
+
 try:
-    engine = create_engine(os.getenv('DATABASE_URL'))
+    # The API always talks to PostgreSQL through asyncpg, whichever driver DATABASE_URL names
+    url = make_url(os.getenv('DATABASE_URL')).set(drivername='postgresql+asyncpg')
+    engine = create_async_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={
+            "server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT)},
+            "statement_cache_size": STATEMENT_CACHE_SIZE,  # asyncpg's own cache
+            "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,  # SQLAlchemy's adapter cache
+        },
+    )
 except exc.ArgumentError as e:
     raise ValueError("Invalid DATABASE_URL") from e
 
-Session = orm.sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit, attribute access must never trigger implicit IO in async code
+Session = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
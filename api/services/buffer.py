@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from typing import List
+import orjson
+import pydantic
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+from app.schemas import AssetType, BardataListAdapter
+from database.engine import Session
+import services.services as services
+import services.cache as cache
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1  # Seconds between background flushes
+FLUSH_BATCH_SIZE = 10000  # Bars written per insert, batches above utils.COPY_THRESHOLD are loaded with COPY
+
+# Serializes flushes, so a flush requested through the API returns only once every buffered bar is written
+_flush_lock = asyncio.Lock()
+
+def buffer_key(asset_type: str, ticker: str) -> str:
+    return f"bardata:{asset_type}:{ticker}"
+
+async def push(asset_type: AssetType, ticker: str, data: List[pydantic.BaseModel]) -> int:
+    """
+    Append bar data entries to a ticker's buffer, to be written to the database by the next flush.
+
+    Parameters:
+    - asset_type: Type of the asset (e.g. Equity, Bond).
+    - ticker: Ticker of the asset.
+    - data: List of bar data entries.
+
+    Returns:
+    - The number of entries buffered.
+    """
+    if not data:
+        return 0
+    try:
+        await cache.client.rpush(buffer_key(asset_type.type, ticker), *[orjson.dumps(entry) for entry in BardataListAdapter.dump_python(data)])
+    except RedisError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Bardata buffer unavailable: {e}")
+    return len(data)
+
+async def _flush_buffer(key: str, asset_type: AssetType, ticker: str) -> int:
+    """
+    Write the entries of a single buffer to the database, in batches of FLUSH_BATCH_SIZE.
+
+    Parameters:
+    - key: The buffer's key.
+    - asset_type: Type of the asset.
+    - ticker: Ticker of the asset.
+
+    Returns:
+    - The number of entries written.
+    """
+    flushed = 0
+    while entries := await cache.client.lpop(key, FLUSH_BATCH_SIZE):
+        data = BardataListAdapter.validate_python([orjson.loads(entry) for entry in entries])
+        try:
+            async with Session() as db:
+                upload, _ = await services.add_bardata(db=db, ticker=ticker, asset_type=asset_type, data=data)
+        except HTTPException as e:
+            # A missing asset, retrying the batch cannot succeed
+            logger.warning(f"Dropped {len(entries)} buffered bars of {ticker}: {e.detail}")
+        except Exception:
+            # The database is unreachable, the batch goes back to the head of the buffer for the next flush
+            await cache.client.lpush(key, *reversed(entries))
+            raise
+        else:
+            if upload['skipped_dates']:
+                logger.info(f"Skipped {len(upload['skipped_dates'])} buffered bars of {ticker} already in the database")
+            flushed += len(upload['bardata'])
+    return flushed
+
+async def flush() -> int:
+    """
+    Write every buffered bar data entry to the database.
+
+    Returns:
+    - The number of entries written.
+    """
+    async with _flush_lock:
+        flushed = 0
+        keys = [key async for key in cache.client.scan_iter(match=buffer_key("*", "*"), _type="list")]
+        for key in keys:
+            _, asset_type, ticker = key.decode().split(":", 2)
+            flushed += await _flush_buffer(key, AssetType[asset_type.upper()], ticker)
+        return flushed
+
+async def clear() -> None:
+    """
+    Drop every buffered bar data entry.
+    """
+    try:
+        keys = [key async for key in cache.client.scan_iter(match=buffer_key("*", "*"))]
+        if keys:
+            await cache.client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Bardata buffer clear failed: {e}")
+
+async def run_flusher() -> None:
+    """
+    Flush the buffers every FLUSH_INTERVAL seconds, until cancelled.
+    """
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        try:
+            # A cancellation arriving mid-flush lets the flush finish instead of losing the popped batch
+            await asyncio.shield(flush())
+        except Exception as e:
+            logger.warning(f"Bardata buffer flush failed: {e}")
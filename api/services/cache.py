@@ -0,0 +1,87 @@
+import os
+import logging
+from typing import Any, Optional
+import orjson
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Time-to-live of cached entries, in seconds
+ASSET_TTL = 300  # Asset rows only change on edit/delete, which evict them
+DETAILS_TTL = 60  # Details carry market figures (market cap, supply)
+
+client = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), socket_connect_timeout=1, socket_timeout=1)
+
+def asset_key(ticker: str) -> str:
+    return f"asset:{ticker}"
+
+def assets_by_type_key(asset_type: str) -> str:
+    return f"assets:{asset_type}"
+
+def details_key(asset_type: str, ticker: str) -> str:
+    return f"details:{asset_type}:{ticker}"
+
+def row(instance) -> dict:
+    """
+    Convert a model instance to a dictionary of all its column values.
+    """
+    return instance.to_dict()
+
+async def get_json(key: str) -> Optional[Any]:
+    """
+    Fetch a cached value.
+
+    Parameters:
+    - key: The cache key.
+
+    Returns:
+    - The decoded value, or None on a miss or if the cache is unreachable.
+    """
+    try:
+        value = await client.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read of '{key}' failed: {e}")
+        return None
+    return orjson.loads(value) if value is not None else None
+
+async def set_json(key: str, value: Any, ttl: int) -> None:
+    """
+    Cache a JSON serializable value.
+
+    Parameters:
+    - key: The cache key.
+    - value: The value to cache.
+    - ttl: Time-to-live in seconds.
+    """
+    try:
+        await client.set(key, orjson.dumps(value), ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Cache write of '{key}' failed: {e}")
+
+async def delete(*keys: str) -> None:
+    """
+    Evict cached values.
+
+    Parameters:
+    - keys: The cache keys to evict.
+    """
+    try:
+        await client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache eviction of {keys} failed: {e}")
+
+async def clear() -> None:
+    """
+    Evict every cached asset and details entry.
+    """
+    try:
+        for pattern in ("asset:*", "assets:*", "details:*"):
+            keys = [key async for key in client.scan_iter(match=pattern)]
+            if keys:
+                await client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache clear failed: {e}")
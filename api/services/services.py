@@ -1,20 +1,32 @@
-from typing import TYPE_CHECKING, List, Optional, Dict
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Dict
 import database.models as models
 from app.schemas import AssetType
 import app.schemas as schemas 
 import pydantic
 from typing import Union, Tuple
 from fastapi import HTTPException, status
-from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.exc import NoResultFound
 if TYPE_CHECKING:
-    from sqlalchemy.orm import Session
-import re
+    from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import datetime as dt
+import orjson
 
 import services.utils as utils
+import services.cache as cache
+from database.engine import Session
+
+# Cap on bardata fetches holding a connection of their own at once, across all requests, so the pool keeps headroom
+BARDATA_FETCH_CONCURRENCY = 10
+_bardata_fetch_slots = asyncio.Semaphore(BARDATA_FETCH_CONCURRENCY)
+
+# Rows fetched from the server side cursor per streamed chunk
+BARDATA_STREAM_CHUNK = 1000
 
 # =================== POST Services =================== 
 # These services create new entries in the database.
-async def create_asset(db: "Session", asset: pydantic.BaseModel) -> schemas.RetrieveAsset:
+async def create_asset(db: "AsyncSession", asset: pydantic.BaseModel) -> schemas.RetrieveAsset:
     """
     Create a new asset in the database.
 
@@ -34,22 +46,22 @@ async def create_asset(db: "Session", asset: pydantic.BaseModel) -> schemas.Retr
 
     asset_type = utils.asset_type(asset.type)
 
-    if utils.asset_exists(db=db, ticker = asset.ticker,asset_type=asset_type):
+    if await utils.asset_exists(db=db, ticker = asset.ticker,asset_type=asset_type):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset already present in 'asset' table.")
     
-    new_asset = models.Asset(**asset.dict())
-
     try:
-        db.add(new_asset)
-        db.commit()
-        db.refresh(new_asset)
+        # RETURNING populates the server-generated columns, no refresh needed after commit
+        new_asset = await db.scalar(insert(models.Asset).values(**{**asset.model_dump(), 'type': asset_type.type}).returning(models.Asset))
+        await db.commit()
     except Exception as e:
-        db.rollback()  # Rollback for any unexpected error
+        await db.rollback()  # Rollback for any unexpected error
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    await cache.delete(cache.assets_by_type_key(new_asset.type))
     
     return new_asset, True
 
-async def add_details(db: "Session", ticker:str, asset_type:str,  data: pydantic.BaseModel) -> Tuple[Union[pydantic.BaseModel, str], bool]:
+async def add_details(db: "AsyncSession", ticker:str, asset_type: AssetType,  data: pydantic.BaseModel) -> Tuple[Union[pydantic.BaseModel, str], bool]:
     """
     Add details to an existing asset in the database.
 
@@ -63,32 +75,27 @@ async def add_details(db: "Session", ticker:str, asset_type:str,  data: pydantic
     - db_obj: The asset with added details.
     - True: Operation success status.
     """
-    
-    asset_type = utils.asset_type(asset_type)
 
-    if utils.details_exist(db=db, ticker=ticker, asset_type=asset_type):
+    if await utils.details_exist(db=db, ticker=ticker, asset_type=asset_type):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset already present in {asset_type.type} table.")
 
-    asset = utils.get_asset(db=db, ticker=ticker, asset_type=asset_type)
+    asset_id = await utils.asset_exists(db=db, ticker=ticker, asset_type=asset_type)
 
-    if not asset:
+    if not asset_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset {ticker} non-existant in database.")
 
     
-    db_obj = asset_type.model(**data.dict())
-    db_obj.asset_id = asset.asset_id
-    
     try:
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        # RETURNING populates the server-generated columns, no refresh needed after commit
+        db_obj = await db.scalar(insert(asset_type.model).values(**data.model_dump(), asset_id=asset_id).returning(asset_type.model))
+        await db.commit()
     except Exception as e:
-        db.rollback()  # Rollback for any unexpected error
+        await db.rollback()  # Rollback for any unexpected error
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     
     return db_obj, True
 
-async def add_bardata(db:"Session", ticker:str, asset_type: str,  data: List[pydantic.BaseModel]):
+async def add_bardata(db:"AsyncSession", ticker:str, asset_type: AssetType,  data: List[pydantic.BaseModel]):
     """
     Add bar data (timeseries data) to an asset in the database.
 
@@ -99,38 +106,41 @@ async def add_bardata(db:"Session", ticker:str, asset_type: str,  data: List[pyd
     - data: List of bar data entries.
 
     Returns:
-    - db_objs: List of assets with added bar data.
+    - upload: The inserted bar data rows, as persisted, and the dates skipped as already present.
     - True: Operation success status.
     """
-    
-    asset_type = utils.asset_type(asset_type)
 
-    asset_details = utils.details_exist(db, ticker, asset_type)
-
-    if not asset_details:
+    # The whole list is dumped in a single call into pydantic-core rather than entry by entry
+    payload = schemas.BardataListAdapter.dump_python(data)
+
+    if not payload:
+        if not await utils.details_exist(db, ticker, asset_type):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset non-existant in {asset_type.type} table.")
+        return {'bardata': [], 'skipped_dates': []}, True
+
+    # Bardata commits skip waiting on the WAL flush. A server crash can lose the last uploads acknowledged
+    # in the past fraction of a second, which clients can re-upload, but never corrupts the tables.
+    # Asset and details writes keep the default durable commit.
+    await db.execute(text("SET LOCAL synchronous_commit = OFF"))
+
+    # The asset id is resolved inside the INSERT ... SELECT, no lookup round-trips beforehand
+    if len(payload) > utils.COPY_THRESHOLD:
+        bardata = await utils.copy_bardata(db, asset_type, ticker, payload)
+    else:
+        keys = utils.bardata_keys(asset_type.bardata_model)
+        bardata = [dict(zip(keys, row)) for row in await db.execute(utils.bardata_insert(asset_type, ticker, payload))]
+
+    # Nothing is inserted either when the asset has no row in the details table or when every date is a duplicate
+    if not bardata and not await utils.details_exist(db, ticker, asset_type):
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset non-existant in {asset_type.type} table.")
+    await db.commit()
 
-    db_objs = []
-    for entry in data:
-        db_obj = asset_type.bardata_model(**entry.dict())
-        db_obj.asset_id = asset_details.asset_id
-        db_objs.append(db_obj)
-
-    try:
-        db.add_all(db_objs)
-        db.commit()
-        # Refreshing multiple objects requires iterating over them
-        for obj in db_objs:
-            db.refresh(obj)
-    except IntegrityError as e:
-        db.rollback()
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Duplicate date trying to be entered into database.")
-    
-    return db_objs, True
+    return {'bardata': bardata, 'skipped_dates': utils.skipped_dates(payload, bardata)}, True
 
 # =================== GET Services =================== 
 # These services fetch entries from the database.
-async def get_assets(db: "Session", ticker: Optional[str] = None, asset_type: Optional[str] = None):
+async def get_assets(db: "AsyncSession", ticker: Optional[str] = None, asset_type: Optional[AssetType] = None):
     """
     Fetch assets from the database based on ticker and/or asset type.
 
@@ -143,22 +153,33 @@ async def get_assets(db: "Session", ticker: Optional[str] = None, asset_type: Op
     - List of assets that match the criteria.
     """
     if ticker:
+        key = cache.asset_key(ticker)
+        cached = await cache.get_json(key)
+        if cached is not None:
+            return cached
+
         try:    
-            return [db.query(models.Asset).filter_by(ticker=ticker).one()]
+            assets = [(await db.scalars(select(models.Asset).filter_by(ticker=ticker))).one()]
         except NoResultFound:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset {ticker} not present in 'asset' table.")
 
+        await cache.set_json(key, [cache.row(asset) for asset in assets], cache.ASSET_TTL)
+        return assets
+
     if asset_type:
-        type_check = utils.asset_type(asset_type)
-        if not type_check: 
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid asset type.")
-        
-        assets = db.query(models.Asset).filter_by(type=asset_type).all()
+        key = cache.assets_by_type_key(asset_type.type)
+        cached = await cache.get_json(key)
+        if cached is not None:
+            return cached
+
+        assets = (await db.scalars(select(models.Asset).filter_by(type=asset_type.type))).all()
         if not assets:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No assets for given type.")
+
+        await cache.set_json(key, [cache.row(asset) for asset in assets], cache.ASSET_TTL)
         return assets
        
-async def get_bardata(db: "Session", **filter_criteria : Optional[dict]):
+async def get_bardata(db: "AsyncSession", **filter_criteria : Optional[dict]):
     """
     Fetch bar data (timeseries data) for a set of assets based on filter criteria.
 
@@ -170,54 +191,151 @@ async def get_bardata(db: "Session", **filter_criteria : Optional[dict]):
     - results: Dictionary with tickers as keys and corresponding bar data as values.
     """
 
-    results = {}
-    
-    for ticker in filter_criteria['tickers']:
-        try:    
-            queried_asset = db.query(models.Asset).filter_by(ticker = ticker).one()
-        except:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset {ticker} not present in 'asset' table.")
+    tickers = filter_criteria['tickers']
+    tickers_by_id, asset_ids_by_type = await _bardata_assets(db, tickers)
+
+    # Hand the request's connection back to the pool before the fetches check out their own,
+    # a request holding one connection while waiting on another starves the pool under load
+    await db.rollback()
 
-        for asset in AssetType:
-            if asset.type == queried_asset.type:
-                asset_type = asset
+    results = {ticker: [] for ticker in tickers}
 
-        query = db.query(asset_type.bardata_model).filter_by(asset_id = queried_asset.asset_id)
-        query = utils.apply_date_filter(query, asset_type.bardata_model, filter_criteria)
-        bardata_dicts = [bardata.to_dict() for bardata in query.all()]
-        results[ticker] = bardata_dicts
+    # One bardata query per asset type table, run concurrently, rows are bucketed back to their ticker
+    fetched = await asyncio.gather(*(
+        _fetch_bardata(utils.type_from_str(type), asset_ids, filter_criteria)
+        for type, asset_ids in asset_ids_by_type.items()
+    ))
+    for rows in fetched:
+        for bardata in rows:
+            results[tickers_by_id[bardata['asset_id']]].append(bardata)
 
     return results
 
-async def get_details(db: "Session", asset_type_str: str ,ticker: Optional[str] = None, filter_criteria: Optional[dict]= None):
+async def stream_bardata(db: "AsyncSession", **filter_criteria: Optional[dict]) -> AsyncIterator[bytes]:
+    """
+    Stream bar data (timeseries data) for a set of assets as newline delimited JSON, one row per line.
+    The assets are resolved before streaming starts, so a missing ticker is still reported as an error response.
+
+    Parameters:
+    - db: Database session.
+    - filter_criteria: Criteria to filter the assets.
+
+    Returns:
+    - An async iterator of NDJSON chunks, each row carrying its ticker.
+    """
+    tickers_by_id, asset_ids_by_type = await _bardata_assets(db, filter_criteria['tickers'])
+    return _stream_bardata_rows(db, tickers_by_id, asset_ids_by_type, filter_criteria)
+
+async def _stream_bardata_rows(db: "AsyncSession", tickers_by_id: Dict[int, str], asset_ids_by_type: Dict[str, List[int]], filter_criteria: dict) -> AsyncIterator[bytes]:
+    for type, asset_ids in asset_ids_by_type.items():
+        bardata_model = utils.type_from_str(type).bardata_model
+        keys = utils.bardata_keys(bardata_model)
+
+        # Rows are fetched from a server side cursor, memory is bounded by a single partition
+        query = _bardata_query(bardata_model, asset_ids, filter_criteria).execution_options(yield_per=BARDATA_STREAM_CHUNK)
+        async for partition in (await db.stream(query)).partitions():
+            yield b"".join(orjson.dumps(_stream_row(tickers_by_id[row.asset_id], keys, row)) + b"\n" for row in partition)
+
+def _stream_row(ticker: str, keys: tuple, row) -> dict:
+    """
+    Build a streamed bar data row, shaped as schemas.RetrieveBardata serializes it with the row's ticker added.
+    """
+    bardata = {'ticker': ticker, **dict(zip(keys, row))}
+    if bardata.get('adjusted_close', 0) is None:
+        del bardata['adjusted_close']
+    return bardata
+
+async def _bardata_assets(db: "AsyncSession", tickers: List[str]) -> Tuple[Dict[int, str], Dict[str, List[int]]]:
+    """
+    Resolve the assets of a bar data request in a single round-trip.
+
+    Parameters:
+    - db: Database session.
+    - tickers: Tickers of the assets.
+
+    Returns:
+    - tickers_by_id: Ticker of each asset, by asset ID.
+    - asset_ids_by_type: IDs of the assets, by asset type.
+
+    Raises:
+    - HTTPException for the first ticker not present in the database.
+    """
+    assets = (await db.execute(select(models.Asset.asset_id, models.Asset.ticker, models.Asset.type).where(models.Asset.ticker.in_(tickers)))).all()
+    tickers_by_id = {asset.asset_id: asset.ticker for asset in assets}
+
+    found = set(tickers_by_id.values())
+    for ticker in tickers:
+        if ticker not in found:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset {ticker} not present in 'asset' table.")
+
+    asset_ids_by_type = {}
+    for asset in assets:
+        asset_ids_by_type.setdefault(asset.type, []).append(asset.asset_id)
+
+    return tickers_by_id, asset_ids_by_type
+
+def _bardata_query(bardata_model, asset_ids: List[int], filter_criteria: dict):
+    """
+    Build the query reading the bar data of a set of assets, as plain rows rather than ORM instances.
+    """
+    query = select(*utils.bardata_columns(bardata_model)).where(bardata_model.asset_id.in_(asset_ids)).order_by(bardata_model.asset_id, bardata_model.date)
+    return utils.apply_date_filter(query, bardata_model, filter_criteria)
+
+async def _fetch_bardata(asset_type: AssetType, asset_ids: List[int], filter_criteria: dict):
+    """
+    Fetch the bar data of a set of assets of one type, on a session of its own so fetches can run concurrently.
+
+    Parameters:
+    - asset_type: Type of the assets.
+    - asset_ids: IDs of the assets.
+    - filter_criteria: Criteria holding the date range.
+
+    Returns:
+    - The bar data rows, as dictionaries.
+    """
+    bardata_model = asset_type.bardata_model
+    query = _bardata_query(bardata_model, asset_ids, filter_criteria)
+
+    keys = utils.bardata_keys(bardata_model)
+    async with _bardata_fetch_slots, Session() as db:
+        return [dict(zip(keys, row)) for row in await db.execute(query)]
+
+async def get_details(db: "AsyncSession", asset_type: AssetType, ticker: Optional[str] = None, filter_criteria: Optional[dict]= None):
     """
     Fetch asset details for a specific ticker, or set of asset based on a filter criteria.
 
     Parameters:
     - db: Database session.
-    - asset_type_str: asset class.
+    - asset_type: asset class.
     - ticker: ticker (optional)
     - filter_criteria: dictionary of the categories and the fitler values(optional)
 
     Returns:
     - results: List of dictionaries with the asset details.
     """
-    asset_type = utils.asset_type(asset_type_str)
-
-    query = db.query(asset_type.model)
+    query = select(asset_type.model)
 
     if ticker:
+        key = cache.details_key(asset_type.type, ticker)
+        cached = await cache.get_json(key)
+        if cached is not None:
+            return cached
+
+        # Only the id is needed to find the details, the asset row itself is not loaded
         try:    
-            asset = db.query(models.Asset).filter_by(ticker = ticker).one()
-        except: 
+            asset_id = (await db.execute(select(models.Asset.asset_id).filter_by(ticker = ticker))).scalar_one()
+        except NoResultFound: 
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset not present in 'asset' table.")
         try:
-            return [query.filter_by(asset_id = asset.asset_id).one()]
-        except:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset not present in '{asset_type_str}' table.")
+            details = [(await db.scalars(query.filter_by(asset_id = asset_id))).one()]
+        except NoResultFound:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset not present in '{asset_type.type}' table.")
+
+        await cache.set_json(key, [cache.row(detail) for detail in details], cache.DETAILS_TTL)
+        return details
 
     query = utils.apply_filter_criteria(query=query, model = asset_type.model, filter_criteria=filter_criteria)
-    results = query.all()
+    results = (await db.scalars(query)).all()
 
     if not results:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"No assets found with the criteria : {filter_criteria}.")
@@ -225,7 +343,7 @@ async def get_details(db: "Session", asset_type_str: str ,ticker: Optional[str]
     return results
    
 # DELETE Services
-async def delete_asset(db: "Session", ticker: str, asset_id: int):
+async def delete_asset(db: "AsyncSession", ticker: str, asset_id: int):
     """
     Delete an asset from the database using its ticker and ID.
 
@@ -237,18 +355,20 @@ async def delete_asset(db: "Session", ticker: str, asset_id: int):
     Returns:
     - "Asset Deleted": Confirmation message.
     """
-    asset = db.query(models.Asset).filter(models.Asset.ticker == ticker, models.Asset.asset_id == asset_id).first()
+    asset = await db.scalar(select(models.Asset).filter(models.Asset.ticker == ticker, models.Asset.asset_id == asset_id))
 
     if not asset:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Asset with ticker {ticker} and asset_id {asset_id} not found.")
 
-    db.delete(asset)
-    db.commit()
+    await db.delete(asset)
+    await db.commit()
+
+    await cache.delete(cache.asset_key(ticker), cache.assets_by_type_key(asset.type), cache.details_key(asset.type, ticker))
 
     return f"Asset with ticker {ticker} and asset_id {asset_id} successfully deleted."
 
 # Put Methods
-async def edit_asset(db: "Session", asset_id: int, edits:dict):
+async def edit_asset(db: "AsyncSession", asset_id: int, edits:dict):
     """
     Edit an asset in the database using its ID.
 
@@ -261,24 +381,37 @@ async def edit_asset(db: "Session", asset_id: int, edits:dict):
     - Modified asset.
     """
 
-    asset_instance = db.query(models.Asset).filter_by(asset_id=asset_id).one_or_none()
-
-    if not asset_instance:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset with asset_id {asset_id} not found.")
-
     if 'asset_id' in edits.keys():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail= "Attribute 'asset_id' cannot be changed.")
     elif 'type' in edits.keys():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Asset 'type' cannot be changed, drop asset and re-add under correct asset class.")
-    
-    # Adjust ticker to new ticker
-    asset_instance.ticker = edits['ticker']
+    elif 'ticker' not in edits.keys():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No 'ticker' edit provided.")
+
+    # Adjust ticker to new ticker in a single round-trip, the self-joined row still holds the old ticker
+    asset = models.Asset.__table__
+    old_asset = asset.alias('old_asset')
+    stmt = (
+        update(asset)
+        .where(asset.c.asset_id == asset_id, old_asset.c.asset_id == asset.c.asset_id)
+        .values(ticker=edits['ticker'])
+        .returning(*asset.c, old_asset.c.ticker.label('old_ticker'))
+    )
+    edited = (await db.execute(stmt)).mappings().one_or_none()
+
+    if not edited:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset with asset_id {asset_id} not found.")
+
+    await db.commit()
+
+    asset_instance = {column.key: edited[column] for column in asset.c}
+    old_ticker = edited['old_ticker']
 
-    db.commit()
+    await cache.delete(cache.asset_key(old_ticker), cache.assets_by_type_key(asset_instance['type']), cache.details_key(asset_instance['type'], old_ticker))
 
     return asset_instance
 
-async def edit_asset_details(db: "Session", asset_type: str, asset_id: int, edits: dict):
+async def edit_asset_details(db: "AsyncSession", asset_type: AssetType, asset_id: int, edits: dict):
     """
     Edit the details of a specific asset using its ID.
 
@@ -291,23 +424,20 @@ async def edit_asset_details(db: "Session", asset_type: str, asset_id: int, edit
     Returns:
     - detail_instance: The modified asset details.
     """
-    
-    # Convert the provided asset type to the corresponding database model.
-    asset_type = utils.asset_type(asset_type)
 
     # Check if any edits have been provided.
     if not edits:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"No edits provided.")
 
     # Retrieve the asset instance from the database using the provided asset ID.
-    asset_instance = db.query(models.Asset).filter_by(asset_id=asset_id).one_or_none()
+    asset_instance = await db.get(models.Asset, asset_id)
 
     # If the asset instance doesn't exist, raise an error.
     if not asset_instance:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset with asset_id {asset_id} not found.")
     
     # Retrieve the detailed information of the asset from the specific asset type table.
-    detail_instance = utils.details_exist(db=db, ticker=asset_instance.ticker, asset_type=asset_type)
+    detail_instance = await utils.get_details(db=db, asset_id=asset_id, asset_type=asset_type)
 
     # If the detailed information doesn't exist, raise an error.
     if not detail_instance:
@@ -317,15 +447,19 @@ async def edit_asset_details(db: "Session", asset_type: str, asset_id: int, edit
     for key, value in edits.items():
         if not hasattr(detail_instance, key):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"'{key}' is not a valid attribute.")
-        setattr(detail_instance, key, value)
+        setattr(detail_instance, key, utils.coerce_value(asset_type.model, key, value))
 
     # Commit the changes to the database.
-    db.commit()
+    await db.commit()
+    # Reload the server-generated 'updated_at'
+    await db.refresh(detail_instance)
+
+    await cache.delete(cache.details_key(asset_type.type, asset_instance.ticker))
 
     # Return the modified asset details.
     return detail_instance
 
-async def edit_bardata(db:"Session",  asset_type: str, asset_id: int, edits: dict):
+async def edit_bardata(db:"AsyncSession",  asset_type: AssetType, asset_id: int, edits: dict):
     """
     Edit the bardata (timeseries data) of a specific asset using its ID.
 
@@ -338,28 +472,26 @@ async def edit_bardata(db:"Session",  asset_type: str, asset_id: int, edits: dic
     Returns:
     - bardata_instance: The modified bardata.
     """
-    
-    # Convert the provided asset type to the corresponding database model.
-    asset_type = utils.asset_type(asset_type)
 
     # Check if any edits have been provided.
     if not edits:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"No edits provided.")
     
     # Check if 'date' attribute is provided in the correct format.
-    date_value = edits.get('date')
-    if not date_value or not re.match(r'^\d{4}-\d{2}-\d{2}$', date_value):
+    try:
+        date = dt.datetime.combine(dt.date.fromisoformat(edits['date']), dt.time.min)
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"'date' attribute should be proivided in YYYY-MM-DD format.")
     
     # Retrieve the asset instance from the database using the provided asset ID.
-    asset_instance = db.query(models.Asset).filter_by(asset_id=asset_id).one_or_none()
+    asset_instance = await db.get(models.Asset, asset_id)
 
     # If the asset instance doesn't exist, raise an error.
     if not asset_instance:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Asset with asset_id {asset_id} not found.")
 
     # Retrieve the bardata instance from the database using the provided asset ID, asset type, and date.
-    bardata_instance = utils.get_bardata_instance(db=db, asset_id=asset_id, asset_type=asset_type, date = edits['date'])
+    bardata_instance = await utils.get_bardata_instance(db=db, asset_id=asset_id, asset_type=asset_type, date = date)
 
     # If the bardata instance doesn't exist, raise an error.
     if not bardata_instance:
@@ -369,10 +501,10 @@ async def edit_bardata(db:"Session",  asset_type: str, asset_id: int, edits: dic
     for key, value in edits.items():
         if not hasattr(bardata_instance, key):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"'{key}' is not a valid attribute.")
-        setattr(bardata_instance, key, value)
+        setattr(bardata_instance, key, utils.coerce_value(asset_type.bardata_model, key, value))
 
     # Commit the changes to the database.
-    db.commit()
+    await db.commit()
 
     # Return the modified bardata.
     return bardata_instance 
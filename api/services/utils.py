@@ -1,11 +1,37 @@
-from typing import TYPE_CHECKING, Optional, Union
-from sqlalchemy.orm import Query
+from typing import TYPE_CHECKING, List, Optional, Union
+import collections
+import datetime as dt
+import operator
+import pydantic
+from sqlalchemy import Column, DateTime, FromClause, Insert, MetaData, Select, Table, cast, column, select, true, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.schema import CreateTable
 import database.models as models
-from app.schemas import AssetType
+import services.cache as cache
+from app.schemas import AssetType, to_naive_utc
 from fastapi import HTTPException, status
 
 if TYPE_CHECKING:
-    from sqlalchemy.orm import Session
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Uploads above this many rows are loaded with COPY, smaller ones in a single INSERT ... SELECT.
+# Also keeps the INSERT's bind parameters well under PostgreSQL's 32767 limit.
+COPY_THRESHOLD = 1000
+
+# AssetType members by their type string, resolved with a dict lookup rather than getattr on the enum
+TYPE_BY_STR = {asset_type.type: asset_type for asset_type in AssetType}
+
+def type_from_str(type_str: str) -> AssetType:
+    """
+    Return the AssetType of a type string read from the database, which is always stored in its exact form.
+
+    Parameters:
+    - type_str: The type string of an asset row.
+
+    Returns:
+    - The corresponding AssetType enum.
+    """
+    return TYPE_BY_STR[type_str]
 
 def asset_type(asset_type_str: str) -> Optional[AssetType]:
     """
@@ -20,12 +46,12 @@ def asset_type(asset_type_str: str) -> Optional[AssetType]:
     Raises:
     - HTTPException if the provided asset type string is invalid.
     """
-    try:
-        return getattr(AssetType, asset_type_str.upper())
-    except AttributeError:
+    asset_type = TYPE_BY_STR.get(asset_type_str.lower())
+    if asset_type is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid asset type.")
+    return asset_type
 
-def get_asset(db: "Session", ticker: str, asset_type: AssetType) -> models.Asset:
+async def get_asset(db: "AsyncSession", ticker: str, asset_type: AssetType) -> models.Asset:
     """
     Retrieve an asset from the database based on its ticker and type.
 
@@ -37,9 +63,10 @@ def get_asset(db: "Session", ticker: str, asset_type: AssetType) -> models.Asset
     Returns:
     - An instance of the Asset model or None if not found.
     """
-    return db.query(models.Asset).filter_by(ticker=ticker, type=asset_type.type).one_or_none()
+    result = await db.execute(select(models.Asset).filter_by(ticker=ticker, type=asset_type.type))
+    return result.scalar_one_or_none()
 
-def get_details(db: "Session", asset_id: int, asset_type: AssetType) -> Union[models.Equity, models.Cryptocurrency, models.CommodityFuture]:
+async def get_details(db: "AsyncSession", asset_id: int, asset_type: AssetType) -> Union[models.Equity, models.Cryptocurrency, models.CommodityFuture]:
     """
     Fetch the detailed information of an asset based on its ID and type.
 
@@ -51,9 +78,9 @@ def get_details(db: "Session", asset_id: int, asset_type: AssetType) -> Union[mo
     Returns:
     - An instance of the specific asset detail model or None if not found.
     """
-    return db.query(asset_type.model).filter_by(asset_id=asset_id).first()
+    return await db.scalar(select(asset_type.model).filter_by(asset_id=asset_id))
 
-def get_bardata_instance(db: "Session", asset_id: int, date: str, asset_type: AssetType) -> Union[models.EquityBarData, models.CryptocurrencyBarData, models.CommodityFutureBarData]:
+async def get_bardata_instance(db: "AsyncSession", asset_id: int, date: dt.datetime, asset_type: AssetType) -> Union[models.EquityBarData, models.CryptocurrencyBarData, models.CommodityFutureBarData]:
     """
     Retrieve the bardata instance for a specific asset based on its ID, date, and type.
 
@@ -66,11 +93,13 @@ def get_bardata_instance(db: "Session", asset_id: int, date: str, asset_type: As
     Returns:
     - An instance of the specific bardata model or None if not found.
     """
-    return db.query(asset_type.bardata_model).filter_by(asset_id=asset_id, date=date).one_or_none()
+    result = await db.execute(select(asset_type.bardata_model).filter_by(asset_id=asset_id, date=date))
+    return result.scalar_one_or_none()
 
-def asset_exists(db: "Session", ticker: str, asset_type: AssetType) -> Optional[int]:
+async def asset_exists(db: "AsyncSession", ticker: str, asset_type: AssetType) -> Optional[int]:
     """
     Check if an asset exists in the database based on its ticker and type.
+    Served from the cached asset row when present, only existing assets are cached.
 
     Parameters:
     - db: The database session.
@@ -80,12 +109,22 @@ def asset_exists(db: "Session", ticker: str, asset_type: AssetType) -> Optional[
     Returns:
     - The asset's ID if it exists or None otherwise.
     """
-    asset_instance = get_asset(db=db, ticker=ticker, asset_type=asset_type)
-    return asset_instance.asset_id if asset_instance else None
+    key = cache.asset_key(ticker)
+    cached = await cache.get_json(key)
+    if cached is not None:
+        return next((asset['asset_id'] for asset in cached if asset['type'] == asset_type.type), None)
+
+    asset_instance = await get_asset(db=db, ticker=ticker, asset_type=asset_type)
+    if not asset_instance:
+        return None
+
+    await cache.set_json(key, [cache.row(asset_instance)], cache.ASSET_TTL)
+    return asset_instance.asset_id
 
-def details_exist(db: "Session", ticker: str, asset_type: AssetType) -> Optional[Union[models.Equity, models.Cryptocurrency, models.CommodityFuture]]:
+async def details_exist(db: "AsyncSession", ticker: str, asset_type: AssetType) -> Optional[int]:
     """
     Check if detailed information of an asset exists in the database.
+    Served from the cached details row when present, only existing details are cached.
 
     Parameters:
     - db: The database session.
@@ -93,13 +132,84 @@ def details_exist(db: "Session", ticker: str, asset_type: AssetType) -> Optional
     - asset_type: The type of the asset.
 
     Returns:
-    - The asset's detail instance if it exists or None otherwise.
+    - The asset's ID if its details exist or None otherwise.
     """
-    asset_id = asset_exists(db=db, ticker=ticker, asset_type=asset_type)
-    details_instance = get_details(db=db, asset_id=asset_id, asset_type=asset_type)
-    return details_instance if details_instance else None
+    key = cache.details_key(asset_type.type, ticker)
+    cached = await cache.get_json(key)
+    if cached:
+        return cached[0]['asset_id']
 
-def apply_filter_criteria(query: Query, model, filter_criteria: dict) -> Query:
+    # The asset and its details are looked up in a single round-trip
+    details_instance = await db.scalar(
+        select(asset_type.model)
+        .join(models.Asset, models.Asset.asset_id == asset_type.model.asset_id)
+        .where(models.Asset.ticker == ticker, models.Asset.type == asset_type.type)
+    )
+    if not details_instance:
+        return None
+
+    await cache.set_json(key, [cache.row(details_instance)], cache.DETAILS_TTL)
+    return details_instance.asset_id
+
+# Validators of the non DateTime column types, lax mode parses strings such as "5"
+_TYPE_ADAPTERS = {python_type: pydantic.TypeAdapter(python_type) for python_type in (int, float, str)}
+
+def coerce_value(model, key: str, value):
+    """
+    Convert a JSON value to the python type expected by a model column.
+
+    asyncpg binds parameters with their declared column types, so values sent as strings
+    have to be parsed before they reach a numeric or DateTime column, and date offsets
+    converted to naive UTC.
+
+    Parameters:
+    - model: The database model the value is destined for.
+    - key: The column name.
+    - value: The raw value.
+
+    Returns:
+    - The value, as the column's python type.
+
+    Raises:
+    - HTTPException if the value cannot be converted to the column's type.
+    """
+    col = model.__table__.columns.get(key)
+    if col is None or value is None:
+        return value
+
+    if isinstance(col.type, DateTime):
+        if not isinstance(value, str):
+            return value
+        try:
+            return to_naive_utc(dt.datetime.fromisoformat(value))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"'{key}' should be provided in YYYY-MM-DD format.")
+
+    adapter = _TYPE_ADAPTERS.get(col.type.python_type)
+    if adapter is None:
+        return value
+    try:
+        return adapter.validate_python(value)
+    except pydantic.ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"'{key}': {e.errors(include_url=False)[0]['msg']}")
+
+def _filter_index(model) -> dict:
+    """
+    Map every filter key accepted for a model to the column it targets and the comparison it applies.
+    Each column 'x' accepts 'x' (equal), 'x_gte' (greater or equal) and 'x_lte' (less or equal).
+    """
+    index = {}
+    for col in model.__table__.columns:
+        attribute = getattr(model, col.key)
+        index[col.key] = (attribute, operator.eq)
+        index[f"{col.key}_gte"] = (attribute, operator.ge)
+        index[f"{col.key}_lte"] = (attribute, operator.le)
+    return index
+
+# Filter keys of the asset details models, built once rather than parsed on every request
+FILTER_INDEX = {asset_type.model: _filter_index(asset_type.model) for asset_type in AssetType}
+
+def apply_filter_criteria(query: Select, model, filter_criteria: dict) -> Select:
     """
     Modify a query object based on provided filtering criteria.
 
@@ -114,23 +224,166 @@ def apply_filter_criteria(query: Query, model, filter_criteria: dict) -> Query:
     Raises:
     - HTTPException if an invalid attribute is provided in the filter criteria.
     """
+    filter_index = FILTER_INDEX[model]
     for key, value in filter_criteria.items():
-        if hasattr(model, key):
-            if "gte" in key:
-                attribute = getattr(model, key.split("_")[0])  # Assumes format like "attribute_gte"
-                query = query.filter(attribute >= value)
-            elif "lte" in key:
-                attribute = getattr(model, key.split("_")[0])  # Assumes format like "attribute_lte"
-                query = query.filter(attribute <= value)
-            else:
-                attribute = getattr(model, key)
-                query = query.filter(attribute == value)
-        else:
+        try:
+            attribute, compare = filter_index[key]
+        except KeyError:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"'{key}' is not a valid attribute.")
+        query = query.filter(compare(attribute, coerce_value(model, attribute.key, value)))
         
     return query
 
-def apply_date_filter(query: Query, model, filter_criteria: dict) -> Query:
+def bardata_columns(model) -> list:
+    """
+    Build the column list used to read bardata.
+    The surrogate 'record_id' is left out so reads stay covered by the (asset_id, date) index.
+
+    Parameters:
+    - model: The bardata model being read.
+
+    Returns:
+    - The list of columns to select.
+    """
+    return _BARDATA_COLUMNS[model]
+
+def bardata_keys(model) -> tuple:
+    """
+    Return the keys of the columns built by bardata_columns, in the same order, for zipping rows into dictionaries.
+
+    Parameters:
+    - model: The bardata model being read.
+
+    Returns:
+    - The tuple of column keys.
+    """
+    return _BARDATA_KEYS[model]
+
+# Built once per bardata model rather than on every read
+_BARDATA_COLUMNS = {
+    asset_type.bardata_model: [column for column in asset_type.bardata_model.__table__.columns if not column.primary_key]
+    for asset_type in AssetType
+}
+_BARDATA_KEYS = {model: tuple(column.key for column in columns) for model, columns in _BARDATA_COLUMNS.items()}
+
+def _bardata_entry_columns(model) -> list:
+    """
+    Return the bardata columns supplied by an upload, everything but the surrogate key and the asset id.
+    """
+    return [c for c in model.__table__.columns if not c.primary_key and c.key != 'asset_id']
+
+def _bardata_insert_from(asset_type: AssetType, ticker: str, entries: FromClause) -> Insert:
+    """
+    Build an INSERT ... SELECT adding the rows of an entries relation to an asset identified by its ticker.
+    The entries are joined against the asset and its details, so nothing is inserted when the
+    asset is not present in the asset type's details table. Entries whose date the asset already
+    holds are skipped by ON CONFLICT DO NOTHING, the rest of the upload is still inserted.
+
+    Parameters:
+    - asset_type: The type of the asset.
+    - ticker: The ticker of the asset.
+    - entries: A relation holding one column per bardata entry field.
+
+    Returns:
+    - The insert statement, returning each inserted row.
+    """
+    model = asset_type.bardata_model
+    columns = _bardata_entry_columns(model)
+
+    source = (
+        # A VALUES column holding only NULLs would otherwise be typed as text by PostgreSQL
+        select(models.Asset.asset_id, *[cast(entries.c[c.key], c.type) for c in columns])
+        .join(asset_type.model, asset_type.model.asset_id == models.Asset.asset_id)
+        .join(entries, true())
+        .where(models.Asset.ticker == ticker, models.Asset.type == asset_type.type)
+    )
+    return (
+        pg_insert(model).from_select(['asset_id', *[c.key for c in columns]], source)
+        .on_conflict_do_nothing(index_elements=['asset_id', 'date'])
+        .returning(*bardata_columns(model))
+    )
+
+def bardata_insert(asset_type: AssetType, ticker: str, entries: List[dict]) -> Insert:
+    """
+    Build a single INSERT ... SELECT adding bardata entries, sent inline as a VALUES list.
+
+    Parameters:
+    - asset_type: The type of the asset.
+    - ticker: The ticker of the asset.
+    - entries: The bardata entries, as dictionaries.
+
+    Returns:
+    - The insert statement, returning each inserted row.
+    """
+    columns = _bardata_entry_columns(asset_type.bardata_model)
+
+    entries_values = values(*[column(c.key, c.type) for c in columns], name='entries').data(
+        [tuple(entry.get(c.key) for c in columns) for entry in entries]
+    )
+    return _bardata_insert_from(asset_type, ticker, entries_values)
+
+async def copy_bardata(db: "AsyncSession", asset_type: AssetType, ticker: str, entries: List[dict]) -> List[dict]:
+    """
+    Add bardata entries through PostgreSQL's COPY protocol, used for uploads too large for a VALUES list.
+    The entries are copied into a temporary staging table dropped on commit, then moved into the
+    bardata table by the same INSERT ... SELECT used for smaller uploads.
+    Runs inside the caller's transaction, which is responsible for committing.
+
+    Parameters:
+    - db: The database session.
+    - asset_type: The type of the asset.
+    - ticker: The ticker of the asset.
+    - entries: The bardata entries, as dictionaries.
+
+    Returns:
+    - The inserted rows, empty if the asset has no details.
+    """
+    model = asset_type.bardata_model
+    columns = _bardata_entry_columns(model)
+
+    staging = Table(
+        f"{model.__tablename__}_staging", MetaData(),
+        *[Column(c.key, c.type) for c in columns],
+        prefixes=['TEMPORARY'], postgresql_on_commit='DROP',
+    )
+
+    await db.execute(CreateTable(staging))
+
+    connection = await (await db.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(
+        staging.name,
+        records=[tuple(entry.get(c.key) for c in columns) for entry in entries],
+        columns=[c.key for c in columns],
+    )
+
+    keys = bardata_keys(model)
+    return [dict(zip(keys, row)) for row in (await db.execute(_bardata_insert_from(asset_type, ticker, staging)))]
+
+def skipped_dates(entries: List[dict], rows: List[dict]) -> List[dt.datetime]:
+    """
+    Return the dates of the bardata entries an insert skipped, in upload order.
+    A date uploaded twice in the same batch is inserted once and skipped once.
+
+    Parameters:
+    - entries: The bardata entries uploaded, as dictionaries.
+    - rows: The rows the insert returned.
+
+    Returns:
+    - The skipped dates.
+    """
+    inserted = collections.Counter(row['date'] for row in rows)
+    skipped = []
+    for entry in entries:
+        date = entry['date']
+        if not isinstance(date, dt.datetime):
+            date = dt.datetime.combine(date, dt.time.min)
+        if inserted[date]:
+            inserted[date] -= 1
+        else:
+            skipped.append(date)
+    return skipped
+
+def apply_date_filter(query: Select, model, filter_criteria: dict) -> Select:
     """
     Modify a query object to filter based on date range.
 
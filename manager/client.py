@@ -1,3 +1,4 @@
+import orjson
 import requests
 from urllib.parse import urljoin
 import datetime as dt
@@ -12,11 +13,13 @@ class Client:
     
     Attributes:
         BASE_URL (str): Default API base URL.
+        TIMEOUT (int): Seconds to wait for the API before a request fails.
         base_url (str): Instance-specific base URL.
         session (Session): Persistent session for making HTTP requests.
     """
 
     BASE_URL = "http://127.0.0.1:8000"  # Default base URL for the API.
+    TIMEOUT = 30
 
     def __init__(self, base_url=None):
         """
@@ -28,6 +31,7 @@ class Client:
         """
         self.base_url = base_url or self.BASE_URL
         self.session = requests.Session()  # Persistent session for efficient HTTP requests.
+        self.session.headers.update({"Content-Type": "application/json", "Accept": "application/json"})
 
     @staticmethod
     def _error_handling(response):
@@ -44,14 +48,14 @@ class Client:
             dict: Standardized response dictionary.
         """
         # Process responses based on HTTP status codes
-        if response.status_code == 200:
-            return {"success": True, "data": response.json()}
+        if response.status_code in (200, 202):
+            return {"success": True, "data": orjson.loads(response.content)}
         elif response.status_code == 400:
-            return {"success": False, "error": response.json().get("detail", "Unknown error.")}
+            return {"success": False, "error": orjson.loads(response.content).get("detail", "Unknown error.")}
         elif response.status_code == 404:
             return {"success": False, "error": 'Invalid asset type.'}
         elif response.status_code == 422:
-            error_details = response.json().get("detail", [])
+            error_details = orjson.loads(response.content).get("detail", [])
             error_messages = [f" '{' -> '.join([part for part in detail.get('loc', []) if part != 'body' and not isinstance(part, int)])}': {detail.get('msg', 'Unknown error')} " for detail in error_details]
             user_friendly_error = " & ".join(error_messages)
             return {'success': False, "error": user_friendly_error}
@@ -73,7 +77,9 @@ class Client:
             dict: Standardized response dictionary.
         """
         url = urljoin(self.base_url, endpoint)
-        response = getattr(self.session, method)(url, json=data, params=params)
+        # Bodies are encoded with orjson, much faster than the standard json module on large bardata uploads
+        body = orjson.dumps(data) if data is not None else None
+        response = getattr(self.session, method)(url, data=body, params=params, timeout=self.TIMEOUT)
         return self._error_handling(response)
     
     def test_database_connection(self):
@@ -188,11 +194,39 @@ class Client:
             - data (dict): Dictionary containing the bar data fields and their respective values.
         
         Returns:
-            Response object containing the result of the creation request.
+            Response object containing the result of the creation request, the inserted bar data under 'bardata' 
+            and the dates already present in the database, which were skipped, under 'skipped_dates'.
         """
         endpoint = f"/api/{asset_type}/{ticker}/bardata/"
         return self._request("post", endpoint, data=data)
 
+    def buffer_bardata(self, ticker:str, asset_type:str, data:List[dict]):
+        """
+        Queue bar data entries for a specific asset, to be written to the database in bulk by the API.
+        
+        Suited to high frequency feeds. Entries are validated on submission, while duplicate dates and
+        missing assets are only detected when the buffer is flushed.
+        
+        Parameters:
+            - ticker (str): The ticker symbol of the asset.
+            - asset_type (str): The type of the asset (e.g., "equity", "cryptocurrency").
+            - data (List[dict]): List of dictionaries containing the bar data fields and their respective values.
+        
+        Returns:
+            Response object containing the number of entries buffered.
+        """
+        endpoint = f"/api/{asset_type}/{ticker}/bardata/buffer"
+        return self._request("post", endpoint, data=data)
+
+    def flush_bardata(self):
+        """
+        Write every buffered bar data entry to the database.
+        
+        Returns:
+            Response object containing the number of entries written.
+        """
+        return self._request("post", "/api/bardata/flush")
+
     def get_bardata(self, tickers:Union[List[str], str], start_date:str, end_date:Optional[str] = None):
         """
         Retrieve historical bar data for a set of tickers within a specified date range.
@@ -213,6 +247,30 @@ class Client:
         }
         return self._request("post", "/api/bardata/", data=data)
 
+    def stream_bardata(self, tickers:List[str], start_date:str, end_date:Optional[str] = None):
+        """
+        Retrieve historical bar data for a set of tickers as a stream of rows, without holding the full response in memory.
+        
+        Parameters:
+            - tickers (List[str]): The tickers for which to fetch the bar data.
+            - start_date (str): The start date of the desired data range in 'YYYY-MM-DD' format.
+            - end_date (Optional[str]): The end date of the desired data range in 'YYYY-MM-DD' format.
+                                    If not provided, the current date is used.
+        
+        Returns:
+            Response object whose data is an iterator of bar data rows, each including its ticker.
+        """
+        data = {
+            'tickers': tickers,
+            'start_date': start_date,
+            'end_date': end_date if end_date else dt.datetime.now().strftime('%Y-%m-%d')
+        }
+        url = urljoin(self.base_url, "/api/bardata/stream")
+        response = self.session.post(url, data=orjson.dumps(data), timeout=self.TIMEOUT, stream=True)
+        if response.status_code != 200:
+            return self._error_handling(response)
+        return {"success": True, "data": (orjson.loads(line) for line in response.iter_lines() if line)}
+
     def edit_asset(self, asset_id:int, edits:dict):
         """
         Edit the basic details of an asset using its asset_id.
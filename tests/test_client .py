@@ -1,6 +1,8 @@
 import psycopg2
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 import logging, sys
+import datetime as dt
 from MarketDataClient.client import Client
 from typing import Optional, List, Dict
 
@@ -189,7 +191,9 @@ class TestCreateBardata(BaseTest):
 
         self.client.create_bardata(ticker=ticker, asset_type=type, data=[self.commodity_bardata])
         response = self.client.create_bardata(ticker=ticker, asset_type=type, data=[self.commodity_bardata])
-        self.assertEqual(response['error'], 'Duplicate date trying to be entered into database.')
+        self.assertTrue(response['success'])
+        self.assertEqual(response['data']['bardata'], [])
+        self.assertEqual(response['data']['skipped_dates'], ['2023-09-10T00:00:00'])
 
     def test_create_bardata_asset_not_in_assetclass_table(self):
         ticker = 'BTC-USD'
@@ -203,6 +207,41 @@ class TestCreateBardata(BaseTest):
         response = self.client.create_bardata(ticker=ticker, asset_type=type,data=[self.cryptocurrency_bardata])
         self.assertEqual(response['error'],'Asset non-existant in cryptocurrency table.')
 
+    def test_create_bardata_bulk_copy(self):
+        ticker = 'LTC-USD'
+        type = 'cryptocurrency'
+
+        self.asset['ticker'] = ticker
+        self.asset['type'] = type
+
+        self.client.create_asset(asset=self.asset)
+        self.client.create_asset_details(ticker=ticker, asset_type=type, data=self.cryptocurrency_data)
+
+        # Above the API's COPY threshold of 1000 bars, with the first date repeated at the end
+        bulk_bardata = [{**self.cryptocurrency_bardata, 'date': f"{dt.datetime(2020, 1, 1) + dt.timedelta(hours=i):%Y-%m-%dT%H:%M:%S}"} for i in range(1200)]
+        bulk_bardata.append(bulk_bardata[0])
+
+        response = self.client.create_bardata(ticker=ticker, asset_type=type, data=bulk_bardata)
+        self.assertTrue(response['success'])
+        self.assertEqual(len(response['data']['bardata']), 1200)
+        self.assertEqual(response['data']['skipped_dates'], ['2020-01-01T00:00:00'])
+
+        response = self.client.get_bardata(tickers=[ticker], start_date='2020-01-01', end_date='2020-03-01')
+        self.assertEqual(len(response['data'][ticker]), 1200)
+
+    def test_create_bardata_bulk_copy_asset_not_in_assetclass_table(self):
+        ticker = 'XLM-USD'
+        type = 'cryptocurrency'
+
+        self.asset['ticker'] = ticker
+        self.asset['type'] = type
+
+        self.client.create_asset(self.asset)
+
+        bulk_bardata = [{**self.cryptocurrency_bardata, 'date': f"{dt.datetime(2020, 1, 1) + dt.timedelta(hours=i):%Y-%m-%dT%H:%M:%S}"} for i in range(1200)]
+        response = self.client.create_bardata(ticker=ticker, asset_type=type, data=bulk_bardata)
+        self.assertEqual(response['error'], 'Asset non-existant in cryptocurrency table.')
+
     def test_create_bardata_missing_data(self):
         ticker = 'BTC-USD'
         type = 'cryptocurrency'
@@ -213,6 +252,23 @@ class TestCreateBardata(BaseTest):
         response = self.client.create_bardata(ticker=ticker, asset_type=type, data=[self.cryptocurrency_bardata])
         self.assertEqual(response['error'], " 'date': Field required ")
 
+    def test_buffer_bardata_flush(self):
+        ticker = 'ETH-USD'
+        type = 'cryptocurrency'
+
+        self.asset['ticker'] = ticker
+        self.asset['type'] = type
+
+        self.client.create_asset(asset=self.asset)
+        self.client.create_asset_details(ticker=ticker, asset_type=type, data=self.cryptocurrency_data)
+
+        response = self.client.buffer_bardata(ticker=ticker, asset_type=type, data=[self.cryptocurrency_bardata])
+        self.assertEqual(response['data'], {'buffered': 1})
+
+        self.client.flush_bardata()
+        response = self.client.get_bardata(tickers=[ticker], start_date='2023-09-10', end_date='2023-09-10')
+        self.assertEqual(len(response['data'][ticker]), 1)
+
 class TestGetAsset(BaseTest):
     
     def test_get_asset_by_ticker(self):
@@ -256,6 +312,14 @@ class TestGetAsset(BaseTest):
         response = self.client.get_asset(asset_type ='invalid')
         self.assertEqual(response['error'], 'Invalid asset type.')
     
+    def test_get_asset_by_ticker_ignores_type(self):
+        self.asset['ticker'] = 'IGN'
+        self.asset['type'] = 'equity'
+        self.client.create_asset(self.asset)
+
+        response = self.client.get_asset(ticker='IGN', asset_type='invalid')
+        self.assertEqual('IGN', response['data'][0]['ticker'])
+
     def test_get_asset_no_assets_of_type(self):
         response = self.client.get_asset(asset_type = 'cryptocurrency')
         self.assertEqual(response['error'], 'No assets for given type.')
@@ -295,6 +359,53 @@ class TestGetAssetBarData(BaseTest):
 
         self.assertEqual(tickers, queried_tickers)
 
+    def test_get_bardata_concurrent_requests(self):
+        tickers = ['CLF4', 'MSFT']
+        self._create_all_barata('CLF4', 'commodityfuture', self.commodity_data, self.commodity_bardata)
+        self._create_all_barata('MSFT', 'equity', self.equity_data, self.equity_bardata)
+
+        # More concurrent requests than the API's connection pool holds (pool size 20 + overflow 40)
+        with ThreadPoolExecutor(max_workers=100) as executor:
+            responses = list(executor.map(lambda _: Client().get_bardata(tickers, start_date="2023-03-01"), range(100)))
+
+        for response in responses:
+            self.assertTrue(response['success'])
+            self.assertEqual(len(response['data']['MSFT']), 10)
+
+    def test_get_bardata_timezone_aware_dates(self):
+        ticker = 'NFLX'
+        self.asset['ticker'] = ticker
+        self.asset['type'] = 'equity'
+        self.client.create_asset(asset=self.asset)
+        self.client.create_asset_details(ticker=ticker, asset_type='equity', data=self.equity_data)
+
+        self.equity_bardata['date'] = '2021-06-01T02:00:00+02:00'
+        response = self.client.create_bardata(ticker=ticker, asset_type='equity', data=[self.equity_bardata])
+        self.assertTrue(response['success'])
+
+        response = self.client.get_bardata([ticker], start_date='2021-06-01T00:00:00Z', end_date='2021-06-01T00:00:00Z')
+        self.assertTrue(response['success'])
+        self.assertEqual(response['data'][ticker][0]['date'], '2021-06-01T00:00:00')
+
+    def test_stream_bardata(self):
+        tickers = ['CLZ3', 'HON']
+        self._create_all_barata('CLZ3', 'commodityfuture', self.commodity_data, self.commodity_bardata)
+        self.equity_bardata['adjusted_close'] = None
+        self._create_all_barata('HON', 'equity', self.equity_data, self.equity_bardata)
+
+        response = self.client.stream_bardata(tickers, start_date="2023-03-01", end_date="2023-09-01")
+        streamed = list(response['data'])
+        expected = self.client.get_bardata(tickers, start_date="2023-03-01", end_date="2023-09-01")['data']
+
+        # Streamed rows are shaped as the JSON endpoint's, plus their ticker
+        for ticker in tickers:
+            rows = [{key: value for key, value in row.items() if key != 'ticker'} for row in streamed if row['ticker'] == ticker]
+            self.assertEqual(rows, expected[ticker])
+
+    def test_stream_bardata_tickers_not_in_database(self):
+        response = self.client.stream_bardata(['SOL-USD'], start_date='2023-01-01')
+        self.assertEqual(response['error'], "Asset SOL-USD not present in 'asset' table.")
+
     def test_get_bardata_invalid_tickers(self):
         tickers = 'BTC-USD'
         self._create_all_barata(tickers, 'cryptocurrency', self.cryptocurrency_data, self.cryptocurrency_bardata)
@@ -356,6 +467,33 @@ class TestEditAsset(BaseTest):
         response = self.client.edit_asset(asset_id=old_asset['data'][0]['asset_id'], edits=edits)
         self.assertEqual(edits['ticker'],  response['data']['ticker'])
 
+    def test_edit_asset_read_after_write(self):
+        self.asset['ticker'] = 'RAW'
+        self.asset['type'] = 'equity'
+        self.client.create_asset(self.asset)
+        self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.equity_data)
+
+        # Reads before the edit fill the cache
+        old_asset = self.client.get_asset(ticker='RAW')
+        self.client.get_asset(asset_type='equity')
+        self.client.get_asset_details('equity', 'RAW')
+
+        self.client.edit_asset(asset_id=old_asset['data'][0]['asset_id'], edits={"ticker": "RAWNEW"})
+
+        response = self.client.get_asset(ticker='RAW')
+        self.assertEqual(response['error'], "Asset RAW not present in 'asset' table.")
+
+        response = self.client.get_asset(ticker='RAWNEW')
+        self.assertEqual(response['data'][0]['asset_id'], old_asset['data'][0]['asset_id'])
+
+        response = self.client.get_asset(asset_type='equity')
+        tickers = [asset['ticker'] for asset in response['data']]
+        self.assertIn('RAWNEW', tickers)
+        self.assertNotIn('RAW', tickers)
+
+        response = self.client.get_asset_details('equity', 'RAWNEW')
+        self.assertEqual(response['data'][0]['asset_id'], old_asset['data'][0]['asset_id'])
+
     def test_edit_asset_invalid_asset_id(self):
         edits = {
             "ticker": "EDTNEW"
@@ -385,6 +523,15 @@ class TestEditAsset(BaseTest):
         response = self.client.edit_asset(asset_id=db_asset['data'][0]['asset_id'], edits=edits)
         self.assertEqual(response['error'],"Attribute 'asset_id' cannot be changed.")
 
+    def test_edit_asset_no_ticker(self):
+        self.asset['ticker'] = 'NOTK'
+        self.asset['type'] = 'equity'
+        self.client.create_asset(self.asset)
+        db_asset = self.client.get_asset(self.asset['ticker'])
+
+        response = self.client.edit_asset(asset_id=db_asset['data'][0]['asset_id'], edits={})
+        self.assertEqual(response['error'], "No 'ticker' edit provided.")
+
 class TestEditAssetDetails(BaseTest):
     def test_edit_asset_details_valid(self):
         self.asset['ticker'] = 'DETS'
@@ -443,6 +590,34 @@ class TestEditAssetDetails(BaseTest):
         response = self.client.edit_asset_details(asset_id=asset['data'][0]['asset_id'], asset_type='commodityfuture',edits=edits )
         self.assertEqual(response['error'],  "'commodityame' is not a valid attribute.")
 
+    def test_edit_asset_details_read_after_write(self):
+        self.asset['ticker'] = 'RAWD'
+        self.asset['type'] = 'equity'
+        self.client.create_asset(self.asset)
+        self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.equity_data)
+
+        # The read before the edit fills the cache
+        details = self.client.get_asset_details('equity', 'RAWD')
+
+        self.client.edit_asset_details(asset_id=details['data'][0]['asset_id'], asset_type='equity', edits={"company_name": "Edited"})
+
+        response = self.client.get_asset_details('equity', 'RAWD')
+        self.assertEqual(response['data'][0]['company_name'], 'Edited')
+
+    def test_edit_asset_details_string_value(self):
+        self.asset['ticker'] = 'STRV'
+        self.asset['type'] = 'equity'
+        self.client.create_asset(self.asset)
+        response = self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.equity_data)
+        asset_id = response['data']['asset_id']
+
+        response = self.client.edit_asset_details(asset_id=asset_id, asset_type='equity', edits={"market_cap": "5"})
+        self.assertEqual(response['data']['market_cap'], 5)
+
+        response = self.client.edit_asset_details(asset_id=asset_id, asset_type='equity', edits={"market_cap": "five"})
+        self.assertFalse(response['success'])
+        self.assertTrue(response['error'].startswith("'market_cap':"))
+
 class TestEditBardata(BaseTest):
     def test_edit_bardata_valid(self):
         self.asset['ticker'] = 'XRP-USD'
@@ -463,6 +638,24 @@ class TestEditBardata(BaseTest):
         response = self.client.edit_bardata(asset_id=asset['data'][0]['asset_id'],asset_type=self.asset['type'], edits=edits)
         self.assertEqual(edits['high'], response['data']['high'])
 
+    def test_edit_bardata_string_value(self):
+        self.asset['ticker'] = 'ADA-USD'
+        self.asset['type'] = 'cryptocurrency'
+        self.client.create_asset(self.asset)
+
+        self.cryptocurrency_data['cryptocurrency_name'] = "Cardano"
+        self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.cryptocurrency_data)
+        self.client.create_bardata(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=[self.cryptocurrency_bardata])
+
+        edits = {
+            "date" : "2023-09-10",
+            "open" : "7.5"
+        }
+
+        asset = self.client.get_asset(ticker=self.asset['ticker'])
+        response = self.client.edit_bardata(asset_id=asset['data'][0]['asset_id'], asset_type=self.asset['type'], edits=edits)
+        self.assertEqual(response['data']['open'], 7.5)
+
     def test_edit_bardata_invlaid_asset_id(self):
         edits = {
             "date" : "2023-01-01",
@@ -579,6 +772,46 @@ class TestGetAssetDetails(BaseTest):
         for asset in response['data']:
             self.assertEqual(asset['exchange'],filter['exchange'])
 
+    def test_get_asset_details_by_string_filter(self):
+        self.asset['ticker'] = 'STRF'
+        self.asset['type'] = 'equity'
+        self.client.create_asset(self.asset)
+        details = self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.equity_data)
+
+        response = self.client.get_asset_details('equity', filter_criteria={'shares_outstanding': '101010'})
+        self.assertTrue(response['success'])
+        self.assertIn(details['data']['asset_id'], [asset['asset_id'] for asset in response['data']])
+
+    def test_get_asset_details_by_range_filter(self):
+        self.asset['ticker'] = 'SMLL'
+        self.asset['type'] = 'equity'
+        self.client.create_asset(self.asset)
+        self.equity_data['market_cap'] = 100
+        small = self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.equity_data)
+
+        self.asset['ticker'] = 'LRGE'
+        self.client.create_asset(self.asset)
+        self.equity_data['market_cap'] = 1000000000
+        large = self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.equity_data)
+
+        response = self.client.get_asset_details('equity', filter_criteria={'market_cap_gte': 1000000})
+        asset_ids = [asset['asset_id'] for asset in response['data']]
+        self.assertIn(large['data']['asset_id'], asset_ids)
+        self.assertNotIn(small['data']['asset_id'], asset_ids)
+
+        self.asset['ticker'] = 'CLH4'
+        self.asset['type'] = 'commodityfuture'
+        self.client.create_asset(self.asset)
+        self.commodity_data['expiration_date'] = '2024-03-20'
+        late = self.client.create_asset_details(ticker=self.asset['ticker'], asset_type=self.asset['type'], data=self.commodity_data)
+
+        response = self.client.get_asset_details('commodityfuture', filter_criteria={'expiration_date_lte': '2023-12-31'})
+        self.assertTrue(response['success'])
+        self.assertNotIn(late['data']['asset_id'], [asset['asset_id'] for asset in response['data']])
+
+        response = self.client.get_asset_details('commodityfuture', filter_criteria={'expiration_date_lte': '2024-03-20'})
+        self.assertIn(late['data']['asset_id'], [asset['asset_id'] for asset in response['data']])
+
     def test_get_asset_detials_nonexistant_details(self):
         ticker = 'TTV3'
         type ='commodityfuture'